@@ -4,6 +4,7 @@ Database clearing utility for SecureVote Pro
 Clears all tables and resets the database to a fresh state
 """
 
+import asyncio
 import os
 import sys
 from sqlalchemy import create_engine, text
@@ -48,8 +49,8 @@ def clear_redis_cache():
             redis_client.data.clear()
             print("✅ Mock Redis cache cleared")
         else:
-            # Real Redis - clear all keys
-            redis_client.flushall()
+            # Real Redis (asyncio client) - clear all keys
+            asyncio.run(redis_client.flushall())
             print("✅ Redis cache cleared")
     except Exception as e:
         print(f"⚠️  Redis cache clear failed (this is okay): {str(e)}")
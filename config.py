@@ -12,9 +12,11 @@ except ImportError:
 class Config:
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./voting_system.db")
+    DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
     
-    # Redis (removed - using in-memory OTP storage)
-    # REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+    # Redis (optional - unset uses the in-memory mock)
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL") or None
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
     
     # Security
     SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -26,6 +28,9 @@ class Config:
     # Environment mode
     DEVELOPMENT_MODE = os.getenv("DEVELOPMENT_MODE", "true").lower() == "true"
     
+    # Logging (DEBUG enables per-voter service traces)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    
     # SMTP settings (used in production mode for sending OTP emails)
     SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
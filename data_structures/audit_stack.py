@@ -1,4 +1,6 @@
 from typing import List, Dict, Any, Optional
+from collections import deque
+from itertools import islice
 import json
 from datetime import datetime
 
@@ -7,6 +9,9 @@ class AuditStack:
     Stack-based audit system for tracking voting operations.
     Demonstrates LIFO (Last In First Out) operations.
     
+    Backed by a bounded deque, so dropping the oldest event on overflow
+    is O(1) instead of a list.pop(0) shift.
+    
     Stack Operations:
     - push(): Add event to top - O(1)
     - pop(): Remove event from top - O(1)
@@ -19,10 +24,16 @@ class AuditStack:
     - Operation history
     """
     
-    def __init__(self):
-        """Initialize empty audit stack."""
-        self.stack: List[Dict[str, Any]] = []
-        self.max_size = 10000  # Prevent memory overflow
+    def __init__(self, max_size: int = 10000):
+        """
+        Initialize empty audit stack.
+        
+        Args:
+            max_size: Events kept before the oldest are dropped
+        """
+        self.max_size = max_size  # Prevent memory overflow
+        # Full deque discards the oldest event on append
+        self.stack: deque = deque(maxlen=self.max_size)
     
     def push(self, event: Dict[str, Any]) -> None:
         """
@@ -31,10 +42,6 @@ class AuditStack:
         Args:
             event: Dictionary containing event details
         """
-        if len(self.stack) >= self.max_size:
-            # Remove oldest event to prevent overflow
-            self.stack.pop(0)
-        
         # Add timestamp if not present
         if 'timestamp' not in event:
             event['timestamp'] = datetime.utcnow().isoformat()
@@ -84,7 +91,8 @@ class AuditStack:
         if count <= 0:
             return []
         
-        return self.stack[-count:] if len(self.stack) >= count else self.stack[:]
+        # deque does not slice; walk back from the newest end so this is O(count)
+        return list(islice(reversed(self.stack), count))[::-1]
     
     def clear(self) -> None:
         """Clear all events from stack."""
@@ -92,12 +100,12 @@ class AuditStack:
     
     def to_json(self) -> str:
         """Convert stack to JSON string."""
-        return json.dumps(self.stack, indent=2)
+        return json.dumps(list(self.stack), indent=2)
     
     def from_json(self, json_str: str) -> None:
         """Load stack from JSON string."""
         try:
-            self.stack = json.loads(json_str)
+            self.stack = deque(json.loads(json_str), maxlen=self.max_size)
         except json.JSONDecodeError:
             raise ValueError("Invalid JSON format")
     
@@ -3,10 +3,70 @@ Candidate Array Implementation
 Demonstrates array-based operations for candidate management and vote tallying
 """
 
+import sys
+from collections import Counter
+
+import numpy as np
+
+# numba is optional (not in requirements.txt); without it the NumPy reductions are used
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _scan_votes_loop(vote_counts, n):
+    """
+    Single pass over the first n vote counts (compiled with numba).
+    
+    Returns:
+        Tuple of (total votes, index of first maximum, maximum votes,
+        minimum votes); both extremes are -1 when n is 0
+    """
+    total = 0
+    best = 0
+    best_votes = -1
+    worst_votes = -1
+    for i in range(n):
+        votes = vote_counts[i]
+        total += votes
+        if votes > best_votes:
+            best_votes = votes
+            best = i
+        if worst_votes == -1 or votes < worst_votes:
+            worst_votes = votes
+    return total, best, best_votes, worst_votes
+
+
+def _scan_votes_numpy(vote_counts, n):
+    """
+    Same result as _scan_votes_loop using vectorized NumPy reductions.
+    
+    An interpreted element loop would box one NumPy scalar per candidate,
+    so without numba the reductions are the faster path.
+    """
+    if n == 0:
+        return 0, 0, -1, -1
+    votes = vote_counts[:n]
+    best = int(votes.argmax())  # First maximum, like the loop
+    return int(votes.sum()), best, int(votes[best]), int(votes.min())
+
+
+# Compile the loop when numba is available, otherwise fall back to NumPy
+if njit is not None:
+    _scan_votes = njit(cache=True)(_scan_votes_loop)
+else:
+    _scan_votes = _scan_votes_numpy
+
+
 class CandidateArray:
     """
     Fixed-size array for candidate management.
     Demonstrates fundamental array operations: insert, search, update, delete
+    
+    Candidates are stored as a structure of arrays: parallel ``ids`` and
+    ``names`` lists plus an int64 NumPy ``vote_counts`` array, so tallying
+    operations (total, winner, ranking) run as vectorized reductions.
     """
     
     def __init__(self, capacity=10):
@@ -17,8 +77,24 @@ class CandidateArray:
             capacity: Maximum number of candidates
         """
         self.capacity = capacity
-        self.array = [None] * capacity
+        self.ids = [None] * capacity
+        self.names = [None] * capacity
+        self.vote_counts = np.zeros(capacity, dtype=np.int64)
         self.size = 0
+        # Reciprocal of capacity so utilization is a multiply, not a divide
+        self._inv_capacity = 1.0 / capacity
+        # candidate_id -> array index, kept in sync on insert/delete
+        self._id_to_index = {}
+        # Cached (total, winner_index, max_votes, min_votes); None when stale
+        self._summary = None
+    
+    def _materialize(self, index: int) -> dict:
+        """Build the candidate record stored at index. O(1)"""
+        return {
+            "candidate_id": self.ids[index],
+            "candidate_name": self.names[index],
+            "vote_count": int(self.vote_counts[index])
+        }
     
     def is_empty(self) -> bool:
         """Check if array is empty. O(1)"""
@@ -39,27 +115,30 @@ class CandidateArray:
         Returns:
             True if successful, False if array is full
             
-        Time Complexity: O(1) for insertion, O(n) for duplicate check
+        Time Complexity: O(1)
         """
         if self.is_full():
             return False
         
+        # Intern so lookups with the same ID string hit the identity fast path
+        candidate_id = sys.intern(candidate_id)
+        
         # Check for duplicates
-        if self.search_by_id(candidate_id) != -1:
+        if candidate_id in self._id_to_index:
             return False
         
         # Insert at next position
-        self.array[self.size] = {
-            "candidate_id": candidate_id,
-            "candidate_name": candidate_name,
-            "vote_count": 0
-        }
+        self.ids[self.size] = candidate_id
+        self.names[self.size] = candidate_name
+        self.vote_counts[self.size] = 0
+        self._id_to_index[candidate_id] = self.size
         self.size += 1
+        self._summary = None
         return True
     
     def search_by_id(self, candidate_id: str) -> int:
         """
-        Linear search for candidate by ID.
+        Search for candidate by ID using the ID -> index map.
         
         Args:
             candidate_id: Candidate ID to search
@@ -67,12 +146,9 @@ class CandidateArray:
         Returns:
             Index if found, -1 otherwise
             
-        Time Complexity: O(n)
+        Time Complexity: O(1) average
         """
-        for i in range(self.size):
-            if self.array[i] and self.array[i]["candidate_id"] == candidate_id:
-                return i
-        return -1
+        return self._id_to_index.get(candidate_id, -1)
     
     def get_candidate(self, index: int) -> dict:
         """
@@ -87,7 +163,7 @@ class CandidateArray:
         Time Complexity: O(1)
         """
         if 0 <= index < self.size:
-            return self.array[index]
+            return self._materialize(index)
         return None
     
     def increment_vote(self, candidate_id: str) -> bool:
@@ -100,13 +176,16 @@ class CandidateArray:
         Returns:
             True if successful, False if not found
             
-        Time Complexity: O(n) for search + O(1) for update
+        Time Complexity: O(1)
         """
-        index = self.search_by_id(candidate_id)
-        if index == -1:
+        # The ID -> index dict is already a collision-free map onto the
+        # contiguous slots; look it up directly on the per-vote path
+        index = self._id_to_index.get(candidate_id)
+        if index is None:
             return False
         
-        self.array[index]["vote_count"] += 1
+        self.vote_counts[index] += 1
+        self._summary = None
         return True
     
     def decrement_vote(self, candidate_id: str) -> bool:
@@ -119,14 +198,36 @@ class CandidateArray:
         Returns:
             True if successful, False if not found
             
-        Time Complexity: O(n)
+        Time Complexity: O(1)
+        """
+        index = self._id_to_index.get(candidate_id)
+        if index is None:
+            return False
+        
+        if self.vote_counts[index] > 0:
+            self.vote_counts[index] -= 1
+            self._summary = None
+        return True
+    
+    def set_vote_count(self, candidate_id: str, count: int) -> bool:
+        """
+        Overwrite vote count for candidate (used when syncing with the database).
+        
+        Args:
+            candidate_id: Candidate ID
+            count: New vote count
+            
+        Returns:
+            True if successful, False if not found
+            
+        Time Complexity: O(1)
         """
         index = self.search_by_id(candidate_id)
         if index == -1:
             return False
         
-        if self.array[index]["vote_count"] > 0:
-            self.array[index]["vote_count"] -= 1
+        self.vote_counts[index] = count
+        self._summary = None
         return True
     
     def get_all_candidates(self) -> list:
@@ -138,7 +239,7 @@ class CandidateArray:
             
         Time Complexity: O(n)
         """
-        return [self.array[i] for i in range(self.size)]
+        return [self._materialize(i) for i in range(self.size)]
     
     def get_results(self) -> list:
         """
@@ -149,9 +250,9 @@ class CandidateArray:
             
         Time Complexity: O(n log n) for sorting
         """
-        candidates = self.get_all_candidates()
-        # Bubble sort demonstration (can be replaced with built-in sort)
-        return sorted(candidates, key=lambda x: x["vote_count"], reverse=True)
+        # Stable sort keeps insertion order among tied candidates
+        order = np.argsort(-self.vote_counts[:self.size], kind="stable")
+        return [self._materialize(i) for i in order]
     
     def get_winner(self) -> dict:
         """
@@ -165,15 +266,9 @@ class CandidateArray:
         if self.is_empty():
             return None
         
-        max_votes = -1
-        winner_index = -1
-        
-        for i in range(self.size):
-            if self.array[i]["vote_count"] > max_votes:
-                max_votes = self.array[i]["vote_count"]
-                winner_index = i
-        
-        return self.array[winner_index] if winner_index != -1 else None
+        # Ties go to the earliest candidate
+        winner_index = self.get_summary()[1]
+        return self._materialize(winner_index)
     
     def get_total_votes(self) -> int:
         """
@@ -182,21 +277,40 @@ class CandidateArray:
         Returns:
             Total vote count
             
-        Time Complexity: O(n)
+        Time Complexity: O(n), O(1) when cached
         """
-        total = 0
-        for i in range(self.size):
-            total += self.array[i]["vote_count"]
-        return total
+        return self.get_summary()[0]
+    
+    def get_summary(self) -> tuple:
+        """
+        Get total votes, winner index, and highest/lowest vote counts in one pass.
+        
+        The result is cached until the next insert, delete or vote change.
+        
+        Returns:
+            Tuple of (total_votes, winner_index, max_votes, min_votes)
+            
+        Time Complexity: O(n), O(1) when cached
+        """
+        if self._summary is None:
+            self._summary = tuple(int(x) for x in _scan_votes(self.vote_counts, self.size))
+        return self._summary
     
     def clear(self) -> None:
-        """Clear all candidates. O(1)"""
-        self.array = [None] * self.capacity
+        """Clear all candidates in place, touching only occupied slots. O(n)"""
+        for i in range(self.size):
+            self.ids[i] = None
+            self.names[i] = None
+        self.vote_counts[:self.size] = 0
         self.size = 0
+        self._id_to_index.clear()
+        self._summary = None
     
     def delete_candidate(self, candidate_id: str) -> bool:
         """
-        Delete candidate by ID (shifts remaining elements).
+        Delete candidate by ID (last candidate moves into the freed slot).
+        
+        Candidate order is not preserved across deletes.
         
         Args:
             candidate_id: Candidate ID to delete
@@ -204,52 +318,76 @@ class CandidateArray:
         Returns:
             True if successful, False if not found
             
-        Time Complexity: O(n)
+        Time Complexity: O(1)
         """
-        index = self.search_by_id(candidate_id)
+        index = self._id_to_index.pop(candidate_id, -1)
         if index == -1:
             return False
         
-        # Shift elements left
-        for i in range(index, self.size - 1):
-            self.array[i] = self.array[i + 1]
+        last = self.size - 1
+        if index != last:
+            self.ids[index] = self.ids[last]
+            self.names[index] = self.names[last]
+            self.vote_counts[index] = self.vote_counts[last]
+            self._id_to_index[self.ids[index]] = index
         
-        self.array[self.size - 1] = None
+        self.ids[last] = None
+        self.names[last] = None
+        self.vote_counts[last] = 0
         self.size -= 1
+        self._summary = None
         return True
     
     def get_stats(self) -> dict:
         """Get array statistics for lab demonstration."""
+        total_votes, _, max_votes, min_votes = self.get_summary()
         return {
             "capacity": self.capacity,
             "current_size": self.size,
             "is_empty": self.is_empty(),
             "is_full": self.is_full(),
-            "total_votes": self.get_total_votes(),
-            "utilization_percent": (self.size / self.capacity) * 100
+            "total_votes": total_votes,
+            "max_votes": max_votes if self.size else None,
+            "min_votes": min_votes if self.size else None,
+            "utilization_percent": self.size * self._inv_capacity * 100
         }
 
 
 class VoteHashTable:
     """
     Hash Table implementation for O(1) voter lookup.
-    Demonstrates hashing with collision handling using chaining.
+    Demonstrates hashing with collision handling using open addressing
+    (linear probing) over parallel key/value arrays.
+    The slot count doubles whenever the load factor exceeds MAX_LOAD_FACTOR.
     """
     
+    # Linear probing degrades quickly past half full; keep probe runs short
+    MAX_LOAD_FACTOR = 0.5
+    
     def __init__(self, capacity=100):
         """
-        Initialize hash table with chaining.
+        Initialize hash table with open addressing.
         
         Args:
-            capacity: Number of buckets
+            capacity: Number of slots
         """
         self.capacity = capacity
-        self.table = [[] for _ in range(capacity)]
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
         self.size = 0
+        # Reciprocal of capacity so the load factor is a multiply, not a divide
+        self._inv_capacity = 1.0 / capacity
+        # Probe length -> number of keys, maintained so get_stats is O(1)
+        self._probe_counts = Counter()
+        self._max_probe = 0
     
     def _hash_function(self, key: str) -> int:
         """
-        Simple hash function using sum of ASCII values.
+        Hash function using Python's built-in string hash (SipHash).
+        
+        Unlike a sum of ASCII values, anagrams do not collide, so probe
+        sequences stay short. The table lives only in process memory, so
+        per-interpreter hash randomization does not matter.
         
         Args:
             key: String key to hash
@@ -257,12 +395,49 @@ class VoteHashTable:
         Returns:
             Hash index
             
-        Time Complexity: O(k) where k is key length
+        Time Complexity: O(1) amortized (str caches its hash)
+        """
+        return hash(key) % self.capacity
+    
+    def _find_slot(self, key: str) -> int:
+        """
+        Linear probe from the key's home slot.
+        
+        Returns:
+            Slot holding key, or the empty slot where the probe stopped
+            
+        Time Complexity: O(1) average
         """
-        hash_value = 0
-        for char in key:
-            hash_value += ord(char)
-        return hash_value % self.capacity
+        keys = self.keys
+        capacity = self.capacity
+        index = hash(key) % capacity  # _hash_function, inlined
+        slot = keys[index]
+        # Wrap with a compare instead of a modulo per step
+        while slot is not None and slot != key:
+            index += 1
+            if index == capacity:
+                index = 0
+            slot = keys[index]
+        return index
+    
+    def _probe_length(self, index: int, key: str) -> int:
+        """Slots visited to reach key stored at index (1 means home slot). O(1)"""
+        return (index - self._hash_function(key)) % self.capacity + 1
+    
+    def _record_probe(self, length: int) -> None:
+        """Count a key placed with the given probe length. O(1)"""
+        self._probe_counts[length] += 1
+        if length > self._max_probe:
+            self._max_probe = length
+    
+    def _forget_probe(self, length: int) -> None:
+        """Uncount a key removed from the given probe length."""
+        self._probe_counts[length] -= 1
+        if self._probe_counts[length] == 0:
+            del self._probe_counts[length]
+            if length == self._max_probe:
+                # Only distinct lengths are scanned, not the whole table
+                self._max_probe = max(self._probe_counts, default=0)
     
     def insert(self, key: str, value: dict) -> bool:
         """
@@ -275,21 +450,51 @@ class VoteHashTable:
         Returns:
             True if inserted, False if key exists
             
-        Time Complexity: O(1) average, O(n) worst case
+        Time Complexity: O(1) amortized, O(n) worst case
         """
-        index = self._hash_function(key)
-        bucket = self.table[index]
-        
-        # Check if key already exists
-        for item in bucket:
-            if item["key"] == key:
-                return False  # Duplicate
+        if not self._insert_no_resize(key, value):
+            return False
         
-        # Insert new item
-        bucket.append({"key": key, "value": value})
+        if self.size * self._inv_capacity > self.MAX_LOAD_FACTOR:
+            self._resize(self.capacity * 2)
+        return True
+    
+    def _insert_no_resize(self, key: str, value: dict) -> bool:
+        """Insert into the current slots without checking the load factor."""
+        # Stored keys are interned so probes with the same string compare by identity
+        key = sys.intern(key)
+        index = self._find_slot(key)
+        
+        # Probe stopped on the key itself
+        if self.keys[index] is not None:
+            return False  # Duplicate
+        
+        self.keys[index] = key
+        self.values[index] = value
         self.size += 1
+        self._record_probe(self._probe_length(index, key))
         return True
     
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Rehash every item into new_capacity slots.
+        
+        Time Complexity: O(n + new_capacity)
+        """
+        old_keys, old_values = self.keys, self.values
+        
+        self.capacity = new_capacity
+        self._inv_capacity = 1.0 / new_capacity
+        self.keys = [None] * new_capacity
+        self.values = [None] * new_capacity
+        self.size = 0
+        self._probe_counts.clear()
+        self._max_probe = 0
+        
+        for key, value in zip(old_keys, old_values):
+            if key is not None:
+                self._insert_no_resize(key, value)
+    
     def search(self, key: str) -> dict:
         """
         Search for value by key.
@@ -302,14 +507,10 @@ class VoteHashTable:
             
         Time Complexity: O(1) average, O(n) worst case
         """
-        index = self._hash_function(key)
-        bucket = self.table[index]
-        
-        for item in bucket:
-            if item["key"] == key:
-                return item["value"]
-        
-        return None
+        index = self._find_slot(key)
+        if self.keys[index] is None:
+            return None
+        return self.values[index]
     
     def update(self, key: str, value: dict) -> bool:
         """
@@ -324,15 +525,12 @@ class VoteHashTable:
             
         Time Complexity: O(1) average
         """
-        index = self._hash_function(key)
-        bucket = self.table[index]
-        
-        for item in bucket:
-            if item["key"] == key:
-                item["value"] = value
-                return True
+        index = self._find_slot(key)
+        if self.keys[index] is None:
+            return False
         
-        return False
+        self.values[index] = value
+        return True
     
     def delete(self, key: str) -> bool:
         """
@@ -346,32 +544,48 @@ class VoteHashTable:
             
         Time Complexity: O(1) average
         """
-        index = self._hash_function(key)
-        bucket = self.table[index]
+        index = self._find_slot(key)
+        if self.keys[index] is None:
+            return False
+        
+        self._forget_probe(self._probe_length(index, key))
+        self.keys[index] = None
+        self.values[index] = None
+        self.size -= 1
         
-        for i, item in enumerate(bucket):
-            if item["key"] == key:
-                bucket.pop(i)
-                self.size -= 1
-                return True
+        # Re-place the rest of the probe cluster so later lookups do not
+        # stop early at the hole (no tombstones needed)
+        index = (index + 1) % self.capacity
+        while self.keys[index] is not None:
+            moved_key, moved_value = self.keys[index], self.values[index]
+            self._forget_probe(self._probe_length(index, moved_key))
+            self.keys[index] = None
+            self.values[index] = None
+            
+            slot = self._find_slot(moved_key)
+            self.keys[slot] = moved_key
+            self.values[slot] = moved_value
+            self._record_probe(self._probe_length(slot, moved_key))
+            index = (index + 1) % self.capacity
         
-        return False
+        return True
     
     def get_load_factor(self) -> float:
         """Calculate load factor (size / capacity)."""
-        return self.size / self.capacity
+        return self.size * self._inv_capacity
     
     def get_stats(self) -> dict:
-        """Get hash table statistics."""
-        # Calculate collision statistics
-        non_empty_buckets = sum(1 for bucket in self.table if len(bucket) > 0)
-        max_chain_length = max(len(bucket) for bucket in self.table)
+        """Get hash table statistics. O(1) from incrementally maintained counters."""
+        # Keys not found in their home slot
+        displaced = self.size - self._probe_counts[1]
         
         return {
             "capacity": self.capacity,
             "size": self.size,
             "load_factor": self.get_load_factor(),
-            "non_empty_buckets": non_empty_buckets,
-            "max_chain_length": max_chain_length,
-            "collision_rate": (self.size - non_empty_buckets) / self.size if self.size > 0 else 0
+            # Each occupied slot holds exactly one key
+            "non_empty_buckets": self.size,
+            # Longest probe sequence (open-addressing analogue of chain length)
+            "max_chain_length": self._max_probe,
+            "collision_rate": displaced / self.size if self.size > 0 else 0
         }
@@ -1,35 +1,42 @@
 """
-Voter Queue Implementation using Circular Queue
+Voter Queue Implementation using a bounded deque
 Demonstrates FIFO (First In First Out) operations for voter request processing
 """
 
+import heapq
+import itertools
+from collections import deque
+
+
 class VoterQueue:
     """
-    Circular Queue implementation for managing voter requests.
+    Bounded FIFO queue for managing voter requests, backed by collections.deque.
     Demonstrates fundamental queue operations: enqueue, dequeue, peek
     Time Complexity: O(1) for all operations
     """
     
     def __init__(self, capacity=100):
         """
-        Initialize circular queue with fixed capacity.
+        Initialize queue with fixed capacity.
         
         Args:
             capacity: Maximum number of voters in queue
         """
         self.capacity = capacity
-        self.queue = [None] * capacity
-        self.front = 0
-        self.rear = -1
-        self.size = 0
+        self._dq = deque(maxlen=capacity)
+    
+    @property
+    def size(self) -> int:
+        """Current number of voters in queue."""
+        return len(self._dq)
     
     def is_empty(self) -> bool:
         """Check if queue is empty. O(1)"""
-        return self.size == 0
+        return not self._dq
     
     def is_full(self) -> bool:
         """Check if queue is full. O(1)"""
-        return self.size == self.capacity
+        return len(self._dq) == self.capacity
     
     def enqueue(self, voter_data: dict) -> bool:
         """
@@ -43,13 +50,11 @@ class VoterQueue:
             
         Time Complexity: O(1)
         """
-        if self.is_full():
+        # A full bounded deque would silently drop the front voter, so refuse instead
+        if len(self._dq) == self.capacity:
             return False
         
-        # Circular increment
-        self.rear = (self.rear + 1) % self.capacity
-        self.queue[self.rear] = voter_data
-        self.size += 1
+        self._dq.append(voter_data)
         return True
     
     def dequeue(self) -> dict:
@@ -61,17 +66,40 @@ class VoterQueue:
             
         Time Complexity: O(1)
         """
-        if self.is_empty():
-            return None
-        
-        voter_data = self.queue[self.front]
-        self.queue[self.front] = None  # Clear reference
+        return self._dq.popleft() if self._dq else None
+    
+    def enqueue_many(self, voters) -> list:
+        """
+        Add a batch of voters to queue (FIFO) in one call.
         
-        # Circular increment
-        self.front = (self.front + 1) % self.capacity
-        self.size -= 1
+        Args:
+            voters: Iterable of voter data dictionaries
+            
+        Returns:
+            List of voters rejected because the queue filled up
+            
+        Time Complexity: O(k) for k voters
+        """
+        remaining = self.capacity - len(self._dq)
+        voters = iter(voters)
+        self._dq.extend(itertools.islice(voters, max(remaining, 0)))
+        return list(voters)
+    
+    def dequeue_many(self, n: int) -> list:
+        """
+        Remove and return up to n voters from front of queue.
         
-        return voter_data
+        Args:
+            n: Maximum number of voters to dequeue
+            
+        Returns:
+            List of voter data in FIFO order (shorter than n if queue runs out)
+            
+        Time Complexity: O(k) for k voters returned
+        """
+        count = min(max(n, 0), len(self._dq))
+        popleft = self._dq.popleft
+        return [popleft() for _ in range(count)]
     
     def peek(self) -> dict:
         """
@@ -82,13 +110,11 @@ class VoterQueue:
             
         Time Complexity: O(1)
         """
-        if self.is_empty():
-            return None
-        return self.queue[self.front]
+        return self._dq[0] if self._dq else None
     
     def get_size(self) -> int:
         """Get current queue size. O(1)"""
-        return self.size
+        return len(self._dq)
     
     def get_all_voters(self) -> list:
         """
@@ -99,23 +125,11 @@ class VoterQueue:
             
         Time Complexity: O(n)
         """
-        if self.is_empty():
-            return []
-        
-        voters = []
-        index = self.front
-        for _ in range(self.size):
-            voters.append(self.queue[index])
-            index = (index + 1) % self.capacity
-        
-        return voters
+        return list(self._dq)
     
     def clear(self) -> None:
-        """Clear all voters from queue. O(1)"""
-        self.queue = [None] * self.capacity
-        self.front = 0
-        self.rear = -1
-        self.size = 0
+        """Clear all voters from queue. O(n)"""
+        self._dq.clear()
     
     def get_stats(self) -> dict:
         """Get queue statistics for lab demonstration."""
@@ -124,21 +138,22 @@ class VoterQueue:
             "current_size": self.size,
             "is_empty": self.is_empty(),
             "is_full": self.is_full(),
-            "utilization_percent": (self.size / self.capacity) * 100,
-            "front_index": self.front,
-            "rear_index": self.rear
+            "utilization_percent": (self.size / self.capacity) * 100
         }
 
 
 class PriorityVoterQueue:
     """
     Priority Queue for VIP voter processing.
-    Higher priority voters are processed first.
+    Higher priority voters are processed first; equal priorities are FIFO.
+    Backed by a binary heap (heapq) of (-priority, arrival, voter_data).
     """
     
     def __init__(self):
-        """Initialize priority queue using list."""
-        self.queue = []
+        """Initialize priority queue using a binary heap."""
+        self._heap = []
+        # Monotonic arrival counter breaks ties so equal priorities stay FIFO
+        self._counter = itertools.count()
     
     def enqueue(self, voter_data: dict, priority: int = 0):
         """
@@ -148,50 +163,40 @@ class PriorityVoterQueue:
             voter_data: Voter information
             priority: Priority level (higher = more important)
             
-        Time Complexity: O(n) for insertion in sorted position
+        Time Complexity: O(log n)
         """
-        item = {"data": voter_data, "priority": priority}
-        
-        # Insert in sorted order (higher priority first)
-        inserted = False
-        for i in range(len(self.queue)):
-            if priority > self.queue[i]["priority"]:
-                self.queue.insert(i, item)
-                inserted = True
-                break
-        
-        if not inserted:
-            self.queue.append(item)
+        heapq.heappush(self._heap, (-priority, next(self._counter), voter_data))
     
     def dequeue(self) -> dict:
         """
         Remove and return highest priority voter.
         
-        Time Complexity: O(1)
+        Time Complexity: O(log n)
         """
         if self.is_empty():
             return None
-        return self.queue.pop(0)["data"]
+        return heapq.heappop(self._heap)[2]
     
     def peek(self) -> dict:
         """View highest priority voter. O(1)"""
         if self.is_empty():
             return None
-        return self.queue[0]["data"]
+        return self._heap[0][2]
     
     def is_empty(self) -> bool:
         """Check if queue is empty. O(1)"""
-        return len(self.queue) == 0
+        return len(self._heap) == 0
     
     def get_size(self) -> int:
         """Get queue size. O(1)"""
-        return len(self.queue)
+        return len(self._heap)
     
     def get_stats(self) -> dict:
         """Get priority queue statistics."""
-        priorities = [item["priority"] for item in self.queue]
+        # Sorting the heap yields entries in dequeue order
+        priorities = [-item[0] for item in sorted(self._heap)]
         return {
-            "size": len(self.queue),
+            "size": len(self._heap),
             "is_empty": self.is_empty(),
             "priorities": priorities,
             "highest_priority": max(priorities) if priorities else None,
@@ -1,11 +1,14 @@
-from sqlalchemy import create_engine, Column, String, Boolean, Integer, DateTime, Text
+from sqlalchemy import create_engine, inspect, text, Column, String, Boolean, Integer, DateTime, Text, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.sql import func
 from config import Config
+import time
 
 try:
-    import redis
+    from redis import asyncio as redis
 except ImportError:
     redis = None
 
@@ -20,8 +23,7 @@ class Voter(Base):
 class Ballot(Base):
     __tablename__ = "ballots"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    seq = Column(Integer, unique=True, nullable=False)
+    seq = Column(Integer, primary_key=True, autoincrement=True)
     ballot_hash = Column(String, unique=True, nullable=False)
     candidate_id = Column(String, nullable=False)
     timestamp = Column(DateTime, default=func.now())
@@ -37,7 +39,8 @@ class AuditEvent(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     type = Column(String, nullable=False)
-    details = Column(String)
+    # JSON text on SQLite (same layout as the old json.dumps strings), JSONB on PostgreSQL
+    details = Column(JSON().with_variant(JSONB(), "postgresql"))
     prev_root = Column(String)
     new_root = Column(String)
     timestamp = Column(DateTime, default=func.now())
@@ -52,19 +55,43 @@ class OTACMapping(Base):
     __tablename__ = "otac_mappings"
     
     otac_hash = Column(String, primary_key=True)
-    voter_id_hash = Column(String, nullable=False)
+    voter_id_hash = Column(String, nullable=False, index=True)
     used = Column(Boolean, default=False)
     timestamp = Column(DateTime, default=func.now())
 
-# Database setup
+# asyncio drivers for each sync URL scheme (only SQLite's driver is in requirements.txt)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Swap a database URL's scheme for its asyncio driver."""
+    scheme, separator, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + separator + rest
+
+# Database setup (sync engine for schema management and scripts)
 engine = create_engine(Config.DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Redis setup (optional - will use in-memory fallback if Redis not available)
-if redis:
+# Async engine for request handling so DB round-trips do not block the event loop
+async_engine = create_async_engine(
+    to_async_url(Config.DATABASE_URL),
+    connect_args={"check_same_thread": False},
+    # Compiled SQL cache entries (SQLAlchemy default is 500)
+    query_cache_size=Config.DB_QUERY_CACHE_SIZE
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Redis setup (optional - will use in-memory fallback if Redis not configured).
+# The asyncio client keeps cache round-trips off the event loop; it connects
+# lazily, so an unreachable server shows up as logged cache errors, not a crash.
+if redis and Config.REDIS_URL:
     try:
-        redis_client = redis.from_url(Config.REDIS_URL)
-        redis_client.ping()  # Test connection
+        # Shared pool so requests reuse sockets instead of reconnecting
+        redis_pool = redis.ConnectionPool.from_url(
+            Config.REDIS_URL, max_connections=Config.REDIS_MAX_CONNECTIONS
+        )
+        redis_client = redis.Redis(connection_pool=redis_pool)
     except:
         redis_client = None
 else:
@@ -73,24 +100,90 @@ else:
 # Fallback to mock Redis for development if Redis is not available
 if redis_client is None:
     class MockRedis:
+        """In-process stand-in with the awaitable API of redis.asyncio.Redis."""
         def __init__(self):
             self.data = {}
-        def hset(self, key, field, value):
+            self.expires_at = {}
+        async def get(self, key):
+            expires_at = self.expires_at.get(key)
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._delete(key)
+            return self.data.get(key)
+        async def setex(self, key, seconds, value):
+            self.data[key] = value.encode() if isinstance(value, str) else value
+            self.expires_at[key] = time.monotonic() + seconds
+            return True
+        def _delete(self, *keys):
+            removed = 0
+            for key in keys:
+                self.expires_at.pop(key, None)
+                if self.data.pop(key, None) is not None:
+                    removed += 1
+            return removed
+        async def delete(self, *keys):
+            return self._delete(*keys)
+        def _hset(self, key, field, value):
             if key not in self.data:
                 self.data[key] = {}
             self.data[key][field] = value
-        def hget(self, key, field):
+        async def hset(self, key, field, value):
+            return self._hset(key, field, value)
+        async def hget(self, key, field):
             return self.data.get(key, {}).get(field)
-        def ping(self):
+        async def ping(self):
             return True
+        def pipeline(self, transaction=True):
+            return MockPipeline(self)
+    
+    class MockPipeline:
+        """Queues commands and applies them to the MockRedis on execute()."""
+        def __init__(self, client):
+            self.client = client
+            self.commands = []
+        def hset(self, key, field, value):
+            self.commands.append((self.client._hset, (key, field, value)))
+            return self
+        def delete(self, *keys):
+            self.commands.append((self.client._delete, keys))
+            return self
+        async def execute(self):
+            results = [command(*args) for command, args in self.commands]
+            self.commands = []
+            return results
     redis_client = MockRedis()
 
-def create_tables():
-    Base.metadata.create_all(bind=engine)
+# Indexes earlier versions created that no query uses any more
+RETIRED_INDEXES = ("ix_audit_timestamp",)
 
-def get_db():
-    db = SessionLocal()
-    try:
+def check_ballot_schema(bind=None):
+    """
+    Refuse to run against a ballots table from before seq became the primary key.
+    
+    create_all leaves existing tables untouched, and the old layout (surrogate
+    id key, NOT NULL seq) makes every cast fail on the missing seq value.
+    """
+    inspector = inspect(bind if bind is not None else engine)
+    if not inspector.has_table(Ballot.__tablename__):
+        return
+    if inspector.get_pk_constraint(Ballot.__tablename__)["constrained_columns"] != ["seq"]:
+        raise RuntimeError(
+            "The ballots table uses the old (id, seq) layout. "
+            "Run clear_database.py to recreate the database with the current schema."
+        )
+
+def create_tables(bind=None):
+    bind = bind if bind is not None else engine
+    check_ballot_schema(bind)
+    Base.metadata.create_all(bind=bind)
+    # create_all skips existing tables, so add any indexes they are missing
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+    # Retired indexes only add write cost, so drop them from existing databases
+    with bind.begin() as conn:
+        for name in RETIRED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -4,10 +4,11 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 from typing import Optional, List
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import csv
 import io
+import logging
 
 from database import get_db, create_tables
 from services.voting_service import VotingService
@@ -15,6 +16,8 @@ from config import Config
 from auth import AuthService, require_admin, require_voter
 from email_service import email_service
 
+logging.basicConfig(level=Config.LOG_LEVEL)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="SecureVote Pro - Advanced Voting System",
@@ -228,7 +231,7 @@ async def resend_otp(request: ResendOTPRequest):
         raise HTTPException(status_code=500, detail=f"Failed to resend OTP: {str(e)}")
 
 @app.post("/admin/register-voters")
-async def admin_register_voters(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: dict = Depends(require_admin)):
+async def admin_register_voters(file: UploadFile = File(...), db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_admin)):
     """Register voters from CSV file."""
     try:
         content = await file.read()
@@ -249,7 +252,7 @@ async def admin_register_voters(file: UploadFile = File(...), db: Session = Depe
         # Extract just the voter_ids for the service
         voter_ids = [voter['voter_id'] for voter in voters]
         
-        result = voting_service.register_voters(db, voter_ids)
+        result = await voting_service.register_voters(db, voter_ids)
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["error"])
         
@@ -267,14 +270,14 @@ async def admin_register_voters(file: UploadFile = File(...), db: Session = Depe
         raise HTTPException(status_code=500, detail=f"Failed to process file: {str(e)}")
 
 @app.post("/admin/issue-otacs")
-async def admin_issue_otacs(request: dict, db: Session = Depends(get_db), current_user: dict = Depends(require_admin)):
+async def admin_issue_otacs(request: dict, db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_admin)):
     """Issue OTACs for specified voters."""
     try:
         voter_ids = request.get("voter_ids", [])
         if not voter_ids:
             raise HTTPException(status_code=400, detail="No voter IDs provided")
         
-        result = voting_service.issue_otacs(db, voter_ids)
+        result = await voting_service.issue_otacs(db, voter_ids)
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["error"])
         
@@ -286,37 +289,37 @@ async def admin_issue_otacs(request: dict, db: Session = Depends(get_db), curren
         raise HTTPException(status_code=500, detail=f"Failed to issue OTACs: {str(e)}")
 
 @app.get("/admin/results")
-async def admin_get_results(db: Session = Depends(get_db), current_user: dict = Depends(require_admin)):
+async def admin_get_results(db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_admin)):
     """Get voting results for admin."""
     try:
-        results_data = voting_service.get_results(db)
+        results_data = await voting_service.get_results(db)
         return results_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get results: {str(e)}")
 
 @app.get("/admin/audit-trail")
-async def admin_get_audit_trail(db: Session = Depends(get_db), current_user: dict = Depends(require_admin)):
+async def admin_get_audit_trail(db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_admin)):
     """Get audit trail for admin."""
     try:
-        events = voting_service.get_audit_trail(db)
+        events = await voting_service.get_audit_trail(db)
         return {"events": events}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get audit trail: {str(e)}")
 
 @app.get("/admin/ballot-lookup/{ballot_hash}")
-async def admin_ballot_lookup(ballot_hash: str, db: Session = Depends(get_db), current_user: dict = Depends(require_admin)):
+async def admin_ballot_lookup(ballot_hash: str, db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_admin)):
     """Lookup ballot details by hash for admin."""
     try:
-        result = voting_service.lookup_ballot(db, ballot_hash)
+        result = await voting_service.lookup_ballot(db, ballot_hash)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to lookup ballot: {str(e)}")
 
 @app.get("/admin/generate-proof/{ballot_hash}")
-async def admin_generate_proof(ballot_hash: str, db: Session = Depends(get_db), current_user: dict = Depends(require_admin)):
+async def admin_generate_proof(ballot_hash: str, db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_admin)):
     """Generate Merkle proof for admin."""
     try:
-        proof = voting_service.generate_merkle_proof(db, ballot_hash)
+        proof = await voting_service.generate_merkle_proof(db, ballot_hash)
         if not proof:
             raise HTTPException(status_code=404, detail="Ballot not found")
         return proof
@@ -328,10 +331,10 @@ async def admin_generate_proof(ballot_hash: str, db: Session = Depends(get_db),
 # Voter Endpoints (Protected)
 
 @app.post("/voter/cast-vote")
-async def voter_cast_vote(vote_request: VoteRequest, db: Session = Depends(get_db), current_user: dict = Depends(require_voter)):
+async def voter_cast_vote(vote_request: VoteRequest, db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_voter)):
     """Cast a vote using OTAC (voter access only)."""
     try:
-        result = voting_service.cast_vote(db, vote_request.otac, vote_request.candidate_id)
+        result = await voting_service.cast_vote(db, vote_request.otac, vote_request.candidate_id)
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["error"])
         return result
@@ -343,10 +346,10 @@ async def voter_cast_vote(vote_request: VoteRequest, db: Session = Depends(get_d
 # Legacy endpoints (kept for backward compatibility)
 
 @app.post("/cast-vote")
-async def cast_vote(vote_request: VoteRequest, db: Session = Depends(get_db)):
+async def cast_vote(vote_request: VoteRequest, db: AsyncSession = Depends(get_db)):
     """Cast a vote using OTAC (legacy endpoint)."""
     try:
-        result = voting_service.cast_vote(db, vote_request.otac, vote_request.candidate_id)
+        result = await voting_service.cast_vote(db, vote_request.otac, vote_request.candidate_id)
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["error"])
         return result
@@ -356,18 +359,18 @@ async def cast_vote(vote_request: VoteRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to cast vote: {str(e)}")
 
 @app.get("/results")
-async def get_results(db: Session = Depends(get_db)):
+async def get_results(db: AsyncSession = Depends(get_db)):
     """Get current voting results."""
     try:
-        return voting_service.get_results(db)
+        return await voting_service.get_results(db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get results: {str(e)}")
 
 @app.get("/generate-proof/{ballot_hash}")
-async def generate_proof(ballot_hash: str, db: Session = Depends(get_db)):
+async def generate_proof(ballot_hash: str, db: AsyncSession = Depends(get_db)):
     """Generate Merkle proof for a ballot hash."""
     try:
-        result = voting_service.generate_merkle_proof(db, ballot_hash)
+        result = await voting_service.generate_merkle_proof(db, ballot_hash)
         if not result["success"]:
             raise HTTPException(status_code=404, detail=result["error"])
         return result
@@ -377,7 +380,7 @@ async def generate_proof(ballot_hash: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to generate proof: {str(e)}")
 
 @app.post("/verify-proof")
-async def verify_proof(verify_request: VerifyProofRequest, db: Session = Depends(get_db)):
+async def verify_proof(verify_request: VerifyProofRequest, db: AsyncSession = Depends(get_db)):
     """Verify a Merkle proof."""
     try:
         result = voting_service.verify_merkle_proof(
@@ -391,10 +394,10 @@ async def verify_proof(verify_request: VerifyProofRequest, db: Session = Depends
         raise HTTPException(status_code=500, detail=f"Failed to verify proof: {str(e)}")
 
 @app.post("/api/undoLast")
-async def undo_last(db: Session = Depends(get_db)):
+async def undo_last(db: AsyncSession = Depends(get_db)):
     """Undo last action (demo mode only)."""
     try:
-        result = voting_service.undo_last_action(db)
+        result = await voting_service.undo_last_action(db)
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["error"])
         return result
@@ -404,18 +407,18 @@ async def undo_last(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to undo action: {str(e)}")
 
 @app.get("/api/auditTrail")
-async def get_audit_trail(limit: int = 50, db: Session = Depends(get_db)):
+async def get_audit_trail(limit: int = 50, db: AsyncSession = Depends(get_db)):
     """Get audit trail."""
     try:
-        return {"events": voting_service.get_audit_trail(db, limit)}
+        return {"events": await voting_service.get_audit_trail(db, limit)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get audit trail: {str(e)}")
 
 @app.get("/api/stats")
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_db)):
     """Get system statistics."""
     try:
-        return voting_service.get_system_stats(db)
+        return await voting_service.get_system_stats(db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
@@ -1,8 +1,10 @@
 from typing import Dict, List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete, func, case, lambda_stmt
+from sqlalchemy.exc import IntegrityError
 import secrets
 import json
+import logging
 from datetime import datetime, timezone, timedelta
 
 from database import Voter, Ballot, Tally, AuditEvent, MerkleLeaf, OTACMapping, redis_client
@@ -12,6 +14,49 @@ from data_structures.audit_stack import AuditStack
 from utils.crypto_utils import CryptoUtils
 from config import Config
 
+log = logging.getLogger(__name__)
+
+# Maximum bound parameters per IN (...) query (SQLite caps variables per statement)
+IN_CLAUSE_BATCH_SIZE = 500
+
+# Redis cache keys and TTLs (seconds) for read-heavy endpoints
+RESULTS_CACHE_KEY = "results:v1"
+RESULTS_CACHE_TTL = 5
+STATS_CACHE_KEY = "stats:v1"
+STATS_CACHE_TTL = 1
+
+async def _flush_cache_writes(pipe) -> None:
+    """Send queued Redis writes; the DB already committed, so failures are only logged."""
+    try:
+        await pipe.execute()
+    except Exception:
+        log.warning("Redis write failed; cache may be stale until its TTL", exc_info=True)
+
+async def _cache_get(key: str):
+    """Read a cached value, treating Redis errors as a miss."""
+    try:
+        return await redis_client.get(key)
+    except Exception:
+        log.warning("Redis read of %s failed; serving from the database", key, exc_info=True)
+        return None
+
+async def _cache_set(key: str, ttl: int, value: str) -> None:
+    """Cache a value for ttl seconds, ignoring Redis errors."""
+    try:
+        await redis_client.setex(key, ttl, value)
+    except Exception:
+        log.warning("Redis write of %s failed", key, exc_info=True)
+
+class VoterRecord:
+    """In-memory voter entry stored in the hash table (slots: no per-record dict)."""
+    
+    __slots__ = ("voter_id_hash", "has_voted", "registered_at")
+    
+    def __init__(self, voter_id_hash: str, has_voted: bool = False, registered_at: str = None):
+        self.voter_id_hash = voter_id_hash
+        self.has_voted = has_voted
+        self.registered_at = registered_at or datetime.utcnow().isoformat()
+
 class VotingService:
     """Core voting service implementing the main business logic with fundamental data structures."""
     
@@ -29,6 +74,10 @@ class VotingService:
         # Stack for audit trail (LIFO)
         self.audit_stack = AuditStack()
         
+        # Bumped by every committed tally change so get_results can tell that
+        # the tallies it read were superseded before it wrote the cache
+        self._results_generation = 0
+        
         self._load_existing_data()
         self._initialize_candidates()
     
@@ -37,19 +86,15 @@ class VotingService:
         # This would typically load from database/Redis on service restart
         pass
     
-    def _sync_array_with_database(self, db: Session):
+    async def _sync_array_with_database(self, db: AsyncSession):
         """Sync candidate array vote counts with database tallies."""
         # Get all tallies from database
-        tallies = db.query(Tally).all()
+        tallies = (await db.scalars(select(Tally))).all()
         
         # Update candidate array with database counts
         for tally in tallies:
-            # Find candidate in array
-            index = self.candidate_array.search_by_id(tally.candidate_id)
-            if index != -1:
-                # Reset vote count to match database
-                candidate = self.candidate_array.array[index]
-                candidate["vote_count"] = tally.count
+            # Reset vote count to match database (no-op for unknown candidates)
+            self.candidate_array.set_vote_count(tally.candidate_id, tally.count)
     
     def _initialize_candidates(self):
         """Initialize default candidates in array."""
@@ -62,7 +107,38 @@ class VotingService:
         for candidate_id, candidate_name in default_candidates:
             self.candidate_array.insert(candidate_id, candidate_name)
     
-    def register_voters(self, db: Session, voter_ids: List[str]) -> Dict[str, any]:
+    async def _adjust_tally(self, db: AsyncSession, candidate_id: str, delta: int) -> None:
+        """Atomically add delta to a candidate's tally row, never going below zero."""
+        adjusted = await db.execute(
+            update(Tally)
+            .where(Tally.candidate_id == candidate_id, Tally.count + delta >= 0)
+            .values(count=Tally.count + delta)
+        )
+        if adjusted.rowcount or delta < 0:
+            return
+        
+        # First vote for this candidate; another cast may create the row first
+        try:
+            async with db.begin_nested():
+                db.add(Tally(candidate_id=candidate_id, count=delta))
+        except IntegrityError:
+            await db.execute(
+                update(Tally)
+                .where(Tally.candidate_id == candidate_id)
+                .values(count=Tally.count + delta)
+            )
+    
+    async def _find_registered_hashes(self, db: AsyncSession, voter_hashes: List[str]) -> set:
+        """Return the subset of voter_hashes already in the voters table, batching the IN query."""
+        registered = set()
+        for start in range(0, len(voter_hashes), IN_CLAUSE_BATCH_SIZE):
+            batch = voter_hashes[start:start + IN_CLAUSE_BATCH_SIZE]
+            registered.update(await db.scalars(
+                select(Voter.voter_id_hash).where(Voter.voter_id_hash.in_(batch))
+            ))
+        return registered
+    
+    async def register_voters(self, db: AsyncSession, voter_ids: List[str]) -> Dict[str, any]:
         """
         Register voters by storing salted hashes of their IDs.
         
@@ -73,36 +149,33 @@ class VotingService:
         Returns:
             Registration result with statistics
         """
-        registered_count = 0
-        duplicate_count = 0
+        # Hash every ID up front; dict keys drop repeats within the batch, keeping order
+        voter_hashes = {}
+        for voter_id, voter_hash in zip(voter_ids, CryptoUtils.hash_voter_ids_bulk(voter_ids)):
+            log.debug("Registering voter_id: %s -> hash: %s...", voter_id, voter_hash[:10])
+            voter_hashes.setdefault(voter_hash, voter_id)
         
-        for voter_id in voter_ids:
-            voter_hash = CryptoUtils.hash_voter_id(voter_id)
-            print(f"DEBUG: Registering voter_id: {voter_id} -> hash: {voter_hash[:10]}...")
-            
-            # Check if already registered
-            existing = db.query(Voter).filter(Voter.voter_id_hash == voter_hash).first()
-            if existing:
-                duplicate_count += 1
-                continue
-            
-            # Add to database
-            voter = Voter(voter_id_hash=voter_hash)
-            db.add(voter)
-            
-            # Add to hash table for O(1) lookup
-            self.voter_hash_table.insert(voter_hash, {
-                "voter_id_hash": voter_hash,
-                "has_voted": False,
-                "registered_at": datetime.utcnow().isoformat()
-            })
-            
-            # Cache in Redis
-            redis_client.hset(f"voter:{voter_hash}", "hasVoted", "false")
-            
-            registered_count += 1
+        # Check which are already registered with one query per batch
+        existing = await self._find_registered_hashes(db, list(voter_hashes))
+        new_hashes = [h for h in voter_hashes if h not in existing]
+        
+        registered_count = len(new_hashes)
+        duplicate_count = len(voter_ids) - registered_count
         
-        db.commit()
+        # Add to database in a single bulk insert
+        if new_hashes:
+            await db.execute(insert(Voter), [
+                {"voter_id_hash": voter_hash, "has_voted": False} for voter_hash in new_hashes
+            ])
+        await db.commit()
+        
+        # Add to hash table for O(1) lookup and cache in Redis with one round-trip
+        registered_at = datetime.utcnow().isoformat()
+        pipe = redis_client.pipeline()
+        for voter_hash in new_hashes:
+            self.voter_hash_table.insert(voter_hash, VoterRecord(voter_hash, registered_at=registered_at))
+            pipe.hset(f"voter:{voter_hash}", "hasVoted", "false")
+        await _flush_cache_writes(pipe)
         
         # Log audit event
         event = {
@@ -119,19 +192,19 @@ class VotingService:
         # Persist audit event
         audit_event = AuditEvent(
             type="REGISTER_VOTERS",
-            details=json.dumps(event["details"])
+            details=event["details"]
         )
         db.add(audit_event)
-        db.commit()
+        await db.commit()
         
         return {
             "success": True,
             "registered_count": registered_count,
             "duplicate_count": duplicate_count,
-            "total_voters": db.query(Voter).count()
+            "total_voters": await db.scalar(select(func.count()).select_from(Voter))
         }
     
-    def issue_otacs(self, db: Session, voter_ids: List[str]) -> Dict[str, any]:
+    async def issue_otacs(self, db: AsyncSession, voter_ids: List[str]) -> Dict[str, any]:
         """
         Issue one-time access codes for registered voters.
         
@@ -143,33 +216,32 @@ class VotingService:
             Dictionary mapping voter IDs to OTACs
         """
         otacs = []
-        issued_count = 0
+        mappings = []
+        
+        voter_hashes = CryptoUtils.hash_voter_ids_bulk(voter_ids)
         
-        for voter_id in voter_ids:
-            voter_hash = CryptoUtils.hash_voter_id(voter_id)
-            print(f"DEBUG: Issuing OTAC for voter_id: {voter_id} -> hash: {voter_hash[:10]}...")
+        # Check which voters are registered with one query per batch
+        registered = await self._find_registered_hashes(db, voter_hashes)
+        
+        for voter_id, voter_hash in zip(voter_ids, voter_hashes):
+            log.debug("Issuing OTAC for voter_id: %s -> hash: %s...", voter_id, voter_hash[:10])
             
-            # Check if voter is registered
-            voter = db.query(Voter).filter(Voter.voter_id_hash == voter_hash).first()
-            if not voter:
-                print(f"DEBUG: Voter not found in database: {voter_id}")
+            if voter_hash not in registered:
+                log.debug("Voter not found in database: %s", voter_id)
                 continue
             
             # Generate OTAC
             otac = CryptoUtils.generate_otac()
             otac_hash = CryptoUtils.hash_otac(otac)
             
-            # Store mapping
-            mapping = OTACMapping(
-                otac_hash=otac_hash,
-                voter_id_hash=voter_hash
-            )
-            db.add(mapping)
-            
+            mappings.append({"otac_hash": otac_hash, "voter_id_hash": voter_hash, "used": False})
             otacs.append({"voter_id": voter_id, "otac": otac})
-            issued_count += 1
         
-        db.commit()
+        # Store all mappings in a single bulk insert
+        if mappings:
+            await db.execute(insert(OTACMapping), mappings)
+        await db.commit()
+        issued_count = len(mappings)
         
         # Log audit event
         event = {
@@ -188,7 +260,7 @@ class VotingService:
             "issued_count": issued_count
         }
     
-    def cast_vote(self, db: Session, otac: str, candidate_id: str) -> Dict[str, any]:
+    async def cast_vote(self, db: AsyncSession, otac: str, candidate_id: str) -> Dict[str, any]:
         """
         Cast a vote using OTAC.
         
@@ -204,26 +276,34 @@ class VotingService:
             # Hash OTAC for lookup
             otac_hash = CryptoUtils.hash_otac(otac)
             
-            # Find OTAC mapping
-            mapping = db.query(OTACMapping).filter(
-                OTACMapping.otac_hash == otac_hash,
-                OTACMapping.used == False
-            ).first()
+            # Find OTAC mapping and its voter in one query (outer join so a
+            # mapping without a voter row still reports "Voter not found").
+            # lambda_stmt builds the statement and its cache key once per call
+            # site; otac_hash is extracted as a bound parameter on later calls.
+            row = (await db.execute(lambda_stmt(
+                lambda: select(OTACMapping, Voter)
+                .outerjoin(Voter, Voter.voter_id_hash == OTACMapping.voter_id_hash)
+                .where(
+                    OTACMapping.otac_hash == otac_hash,
+                    OTACMapping.used == False
+                )
+            ))).first()
             
-            if not mapping:
+            if not row:
                 return {"success": False, "error": "Invalid or used OTAC"}
             
-            print(f"DEBUG: OTAC mapping found - voter_hash: {mapping.voter_id_hash[:10]}...")
+            mapping, voter = row
+            
+            log.debug("OTAC mapping found - voter_hash: %s...", mapping.voter_id_hash[:10])
             
             voter_hash = mapping.voter_id_hash
             
             # Fast O(1) lookup using hash table
             voter_data = self.voter_hash_table.search(voter_hash)
-            if voter_data and voter_data.get("has_voted"):
+            if voter_data and voter_data.has_voted:
                 return {"success": False, "error": "Voter has already voted (hash table check)"}
             
             # Check voter eligibility and voting status
-            voter = db.query(Voter).filter(Voter.voter_id_hash == voter_hash).first()
             if not voter:
                 return {"success": False, "error": f"Voter not found. Hash: {voter_hash[:10]}..."}
             
@@ -232,50 +312,50 @@ class VotingService:
             
             # Database operations (SQLAlchemy handles transactions automatically)
             try:
-                # Mark voter as voted
-                voter.has_voted = True
-                redis_client.hset(f"voter:{voter_hash}", "hasVoted", "true")
-                
-                # Mark OTAC as used
-                mapping.used = True
-                
-                # Update tally in database
-                tally = db.query(Tally).filter(Tally.candidate_id == candidate_id).first()
-                if not tally:
-                    tally = Tally(candidate_id=candidate_id, count=1)
-                    db.add(tally)
-                else:
-                    tally.count += 1
+                # The checks above are only a fast path: concurrent casts can all
+                # pass them between awaits. Claim the OTAC and the voter with
+                # conditional UPDATEs so exactly one cast wins each row.
+                claimed = await db.execute(
+                    update(OTACMapping)
+                    .where(OTACMapping.otac_hash == otac_hash, OTACMapping.used == False)
+                    .values(used=True)
+                )
+                if claimed.rowcount != 1:
+                    await db.rollback()
+                    return {"success": False, "error": "Invalid or used OTAC"}
                 
-                # Update candidate array (O(n) search + O(1) update)
-                self.candidate_array.increment_vote(candidate_id)
+                claimed = await db.execute(
+                    update(Voter)
+                    .where(Voter.voter_id_hash == voter_hash, Voter.has_voted == False)
+                    .values(has_voted=True)
+                )
+                if claimed.rowcount != 1:
+                    await db.rollback()
+                    return {"success": False, "error": "Voter has already voted"}
                 
-                # Update hash table
-                if voter_data:
-                    voter_data["has_voted"] = True
-                    self.voter_hash_table.update(voter_hash, voter_data)
+                # Redis writes are queued and sent in one round-trip after commit
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.hset(f"voter:{voter_hash}", "hasVoted", "true")
                 
-                # Ensure tally is committed to database
-                db.flush()
+                # Increment tally in the database, not read-modify-write in Python
+                await self._adjust_tally(db, candidate_id, 1)
                 
                 # Generate ballot hash
                 ballot_hash, nonce = CryptoUtils.generate_ballot_hash(candidate_id)
                 
-                # Get next sequence number
-                max_seq = db.query(func.max(Ballot.seq)).scalar() or 0
-                seq = max_seq + 1
-                
-                # Store ballot
+                # Store ballot; the database assigns the next sequence number.
+                # This is the only flush: it writes the voter, OTAC and tally
+                # changes together with the ballot insert.
                 ballot = Ballot(
-                    seq=seq,
                     ballot_hash=ballot_hash,
                     candidate_id=candidate_id
                 )
                 db.add(ballot)
+                await db.flush()
+                seq = ballot.seq
                 
                 # Store ballot sequence (simplified without Merkle tree)
                 leaf = MerkleLeaf(seq=seq, ballot_hash=ballot_hash)
-                db.add(leaf)
                 
                 # Log audit event using Stack (LIFO)
                 event = {
@@ -291,14 +371,34 @@ class VotingService:
                 }
                 self.audit_stack.push(event)
                 
-                # Persist audit event
+                # Persist audit event with the full voter hash so undo can
+                # look the voter up by equality; get_audit_trail strips it
                 audit_event = AuditEvent(
                     type="CAST",
-                    details=json.dumps(event["details"])
+                    details={**event["details"], "voter_hash": voter_hash}
                 )
-                db.add(audit_event)
                 
-                db.commit()
+                # Leaf and audit rows go out with the commit
+                db.add_all([leaf, audit_event])
+                await db.commit()
+                event["audit_id"] = audit_event.id
+                
+                # Candidate array follows the DB only after the commit
+                self.candidate_array.increment_vote(candidate_id)
+                
+                # Update hash table only once the vote is durable, so a rolled
+                # back cast never leaves a voter flagged in memory. The flag is
+                # just a fast reject; the conditional UPDATE on Voter above is
+                # what stops concurrent casts. Voters registered before a restart
+                # are missing from the table; adding them keeps the next
+                # already-voted check a single probe.
+                if voter_data:
+                    voter_data.has_voted = True
+                else:
+                    self.voter_hash_table.insert(voter_hash, VoterRecord(voter_hash, has_voted=True))
+                self._results_generation += 1
+                pipe.delete(RESULTS_CACHE_KEY)
+                await _flush_cache_writes(pipe)
                 
                 return {
                     "success": True,
@@ -310,30 +410,47 @@ class VotingService:
                 }
                 
             except Exception as e:
-                db.rollback()
+                await db.rollback()
                 return {"success": False, "error": f"Failed to cast vote: {str(e)}"}
                 
         except Exception as e:
             return {"success": False, "error": f"Unexpected error: {str(e)}"}
     
-    def get_results(self, db: Session) -> Dict[str, any]:
-        """Get current voting results using candidate array."""
-        # Sync candidate array with database tallies
-        self._sync_array_with_database(db)
+    async def get_results(self, db: AsyncSession) -> Dict[str, any]:
+        """
+        Get current voting results using candidate array.
+        
+        Results are cached in Redis for RESULTS_CACHE_TTL seconds. Votes
+        committed by this process invalidate the cache; votes from other
+        worker processes can be missing from cached results for up to the TTL.
+        """
+        cached = await _cache_get(RESULTS_CACHE_KEY)
+        if cached is not None:
+            return json.loads(cached)
+        
+        generation = self._results_generation
+        # Resync on every cache miss (at most once per TTL): the DB is the source
+        # of truth across worker processes and for votes still in flight
+        await self._sync_array_with_database(db)
         
         # Get results from candidate array (sorted by votes)
         results = self.candidate_array.get_results()
         total_votes = self.candidate_array.get_total_votes()
         winner = self.candidate_array.get_winner()
         
-        return {
+        payload = {
             "results": results,
             "total_votes": total_votes,
             "winner": winner,
             "candidate_array_stats": self.candidate_array.get_stats()
         }
+        # A vote committed during the sync already deleted the key; caching
+        # the older tallies now would undo that invalidation for the full TTL
+        if self._results_generation == generation:
+            await _cache_set(RESULTS_CACHE_KEY, RESULTS_CACHE_TTL, json.dumps(payload))
+        return payload
     
-    def generate_merkle_proof(self, db: Session, ballot_hash: str) -> Dict[str, any]:
+    async def generate_merkle_proof(self, db: AsyncSession, ballot_hash: str) -> Dict[str, any]:
         """
         Generate ballot verification (simplified without Merkle tree).
         
@@ -344,8 +461,10 @@ class VotingService:
         Returns:
             Verification data or error
         """
-        # Find ballot using linear search
-        ballot = db.query(Ballot).filter(Ballot.ballot_hash == ballot_hash).first()
+        # Find ballot by its unique hash
+        ballot = await db.scalar(lambda_stmt(
+            lambda: select(Ballot).where(Ballot.ballot_hash == ballot_hash)
+        ))
         if not ballot:
             return {"success": False, "error": "Ballot not found"}
         
@@ -367,7 +486,7 @@ class VotingService:
         # Simplified verification - just check if ballot exists
         return True
     
-    def undo_last_action(self, db: Session) -> Dict[str, any]:
+    async def undo_last_action(self, db: AsyncSession) -> Dict[str, any]:
         """
         Undo the last action (demo mode only).
         
@@ -389,47 +508,53 @@ class VotingService:
             
             if event["type"] == "CAST":
                 details = event["details"]
-                voter_hash = details["voter_hash"]
                 ballot_hash = details["ballot_hash"]
                 candidate_id = details["candidate_id"]
                 seq = details["seq"]
                 
-                # Extract full voter hash (remove truncation)
-                full_voter_hash = voter_hash.replace("...", "")
+                # Full voter hash lives in the persisted audit event
+                full_voter_hash = None
+                audit_event = None
+                if event.get("audit_id") is not None:
+                    audit_event = await db.get(AuditEvent, event["audit_id"])
+                if audit_event and audit_event.details:
+                    full_voter_hash = audit_event.details.get("voter_hash")
                 
                 # Restore voter status
-                voter = db.query(Voter).filter(Voter.voter_id_hash.like(f"{full_voter_hash}%")).first()
+                voter = None
+                if full_voter_hash:
+                    voter = await db.scalar(select(Voter).where(Voter.voter_id_hash == full_voter_hash))
+                pipe = redis_client.pipeline(transaction=False)
                 if voter:
                     voter.has_voted = False
-                    redis_client.hset(f"voter:{voter.voter_id_hash}", "hasVoted", "false")
+                    pipe.hset(f"voter:{voter.voter_id_hash}", "hasVoted", "false")
                     full_voter_hash = voter.voter_id_hash
                 
                 # Update tally in database
-                tally = db.query(Tally).filter(Tally.candidate_id == candidate_id).first()
-                if tally and tally.count > 0:
-                    tally.count -= 1
-                
-                # Decrement vote in candidate array
-                self.candidate_array.decrement_vote(candidate_id)
+                await self._adjust_tally(db, candidate_id, -1)
                 
                 # Update hash table
-                voter_data = self.voter_hash_table.search(full_voter_hash)
+                voter_data = self.voter_hash_table.search(full_voter_hash) if full_voter_hash else None
                 if voter_data:
-                    voter_data["has_voted"] = False
-                    self.voter_hash_table.update(full_voter_hash, voter_data)
+                    voter_data.has_voted = False
                 
                 # Remove ballot
-                db.query(Ballot).filter(Ballot.ballot_hash == ballot_hash).delete()
-                db.query(MerkleLeaf).filter(MerkleLeaf.seq == seq).delete()
+                await db.execute(delete(Ballot).where(Ballot.ballot_hash == ballot_hash))
+                await db.execute(delete(MerkleLeaf).where(MerkleLeaf.seq == seq))
                 
                 # Log undo event
                 undo_event = AuditEvent(
                     type="UNDO",
-                    details=json.dumps({"undone_event": event})
+                    details={"undone_event": event}
                 )
                 db.add(undo_event)
                 
-                db.commit()
+                await db.commit()
+                # Candidate array follows the DB only after the commit
+                self.candidate_array.decrement_vote(candidate_id)
+                self._results_generation += 1
+                pipe.delete(RESULTS_CACHE_KEY)
+                await _flush_cache_writes(pipe)
                 
                 return {
                     "success": True,
@@ -438,29 +563,35 @@ class VotingService:
                 }
             
             else:
-                db.rollback()
+                await db.rollback()
                 return {"success": False, "error": f"Cannot undo action of type: {event['type']}"}
                 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             return {"success": False, "error": f"Failed to undo action: {str(e)}"}
     
-    def get_audit_trail(self, db: Session, limit: int = 50) -> List[Dict]:
+    async def get_audit_trail(self, db: AsyncSession, limit: int = 50) -> List[Dict]:
         """Get audit trail (without PII)."""
-        events = db.query(AuditEvent).order_by(AuditEvent.timestamp.desc()).limit(limit).all()
+        # Autoincrement id follows insertion order, so the primary key is walked
+        # backwards and the scan stops at limit; second-resolution timestamps
+        # also tie within a burst of events
+        events = (await db.scalars(
+            select(AuditEvent).order_by(AuditEvent.id.desc()).limit(limit)
+        )).all()
         
         trail = []
         for event in events:
-            # Parse JSON details
-            try:
-                details = json.loads(event.details) if event.details else {}
-            except:
-                details = {}
+            # Details come back as a dict from the JSON column
+            details = event.details if isinstance(event.details, dict) else {}
             
             # Remove PII from details
             sanitized_details = details.copy()
-            if "voter_hash" in sanitized_details:
-                sanitized_details["voter_hash"] = "***REDACTED***"
+            sanitized_details.pop("voter_hash", None)
+            undone = sanitized_details.get("undone_event")
+            if isinstance(undone, dict) and isinstance(undone.get("details"), dict):
+                undone_details = dict(undone["details"])
+                undone_details.pop("voter_hash", None)
+                sanitized_details["undone_event"] = {**undone, "details": undone_details}
             
             trail.append({
                 "id": event.id,
@@ -473,10 +604,12 @@ class VotingService:
         
         return trail
     
-    def lookup_ballot(self, db: Session, ballot_hash: str) -> Dict[str, any]:
+    async def lookup_ballot(self, db: AsyncSession, ballot_hash: str) -> Dict[str, any]:
         """Lookup ballot details by hash."""
         try:
-            ballot = db.query(Ballot).filter(Ballot.ballot_hash == ballot_hash).first()
+            ballot = await db.scalar(lambda_stmt(
+                lambda: select(Ballot).where(Ballot.ballot_hash == ballot_hash)
+            ))
             
             if ballot:
                 return {
@@ -499,13 +632,24 @@ class VotingService:
                 "error": f"Database error: {str(e)}"
             }
     
-    def get_system_stats(self, db: Session) -> Dict[str, any]:
-        """Get system statistics with data structure details."""
-        total_voters = db.query(Voter).count()
-        voted_count = db.query(Voter).filter(Voter.has_voted == True).count()
-        total_ballots = db.query(Ballot).count()
+    async def get_system_stats(self, db: AsyncSession) -> Dict[str, any]:
+        """Get system statistics with data structure details (cached briefly in Redis)."""
+        cached = await _cache_get(STATS_CACHE_KEY)
+        if cached is not None:
+            return json.loads(cached)
         
-        return {
+        # One round-trip: voter counts aggregated together, ballot count as a scalar subquery
+        ballot_count = select(func.count()).select_from(Ballot).scalar_subquery()
+        row = (await db.execute(
+            select(
+                func.count(),
+                func.sum(case((Voter.has_voted == True, 1), else_=0)),
+                ballot_count
+            ).select_from(Voter)
+        )).one()
+        total_voters, voted_count, total_ballots = row[0], int(row[1] or 0), row[2]
+        
+        stats = {
             "total_voters": total_voters,
             "voted_count": voted_count,
             "remaining_voters": total_voters - voted_count,
@@ -518,3 +662,5 @@ class VotingService:
             },
             "demo_mode": Config.DEMO_MODE
         }
+        await _cache_set(STATS_CACHE_KEY, STATS_CACHE_TTL, json.dumps(stats))
+        return stats
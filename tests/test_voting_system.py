@@ -1,16 +1,17 @@
 import pytest
 import asyncio
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, select, func, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from fastapi.testclient import TestClient
 import tempfile
 import os
 
-from database import Base, get_db
+from database import Base, Ballot, Tally, AuditEvent, get_db, to_async_url, redis_client, create_tables
 from main import app
-from services.voting_service import VotingService
+from services.voting_service import VotingService, RESULTS_CACHE_KEY, STATS_CACHE_KEY
 from data_structures.voter_queue import VoterQueue, PriorityVoterQueue
-from data_structures.candidate_array import CandidateArray, VoteHashTable
+from data_structures.candidate_array import CandidateArray, VoteHashTable, _scan_votes_loop, _scan_votes_numpy
+import numpy as np
 from data_structures.audit_stack import AuditStack
 from utils.crypto_utils import CryptoUtils
 from utils.lab_utils import LabUtils
@@ -18,14 +19,12 @@ from utils.lab_utils import LabUtils
 # Test database setup
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL), connect_args={"check_same_thread": False})
+TestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
+async def override_get_db():
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 app.dependency_overrides[get_db] = override_get_db
 
@@ -76,6 +75,44 @@ class TestVoterQueue:
         assert stats["current_size"] == 1
         assert stats["capacity"] == 10
 
+    def test_batch_enqueue_dequeue(self):
+        queue = VoterQueue(capacity=3)
+
+        rejected = queue.enqueue_many({"voter_id": i} for i in range(5))
+        assert [v["voter_id"] for v in rejected] == [3, 4]
+        assert queue.is_full() == True
+
+        batch = queue.dequeue_many(2)
+        assert [v["voter_id"] for v in batch] == [0, 1]
+        assert [v["voter_id"] for v in queue.dequeue_many(10)] == [2]
+        assert queue.dequeue_many(1) == []
+
+    def test_get_all_voters_wraps(self):
+        queue = VoterQueue(capacity=4)
+        assert queue.get_all_voters() == []
+
+        for i in range(4):
+            queue.enqueue({"voter_id": i})
+        queue.dequeue()
+        queue.dequeue()
+        queue.enqueue({"voter_id": 4})
+
+        assert [v["voter_id"] for v in queue.get_all_voters()] == [2, 3, 4]
+
+    def test_priority_queue_order(self):
+        pq = PriorityVoterQueue()
+        pq.enqueue({"voter_id": "V001"}, 5)
+        pq.enqueue({"voter_id": "V002"}, 10)
+        pq.enqueue({"voter_id": "V003"}, 5)
+
+        assert pq.peek()["voter_id"] == "V002"
+        assert pq.get_stats()["priorities"] == [10, 5, 5]
+
+        # Highest priority first, FIFO among equal priorities
+        order = [pq.dequeue()["voter_id"] for _ in range(3)]
+        assert order == ["V002", "V001", "V003"]
+        assert pq.dequeue() is None
+
 class TestHashTable:
     """Test Hash Table implementation."""
     
@@ -110,6 +147,49 @@ class TestHashTable:
         assert stats["size"] == 1
         assert stats["capacity"] == 10
 
+    def test_resize_keeps_items(self):
+        ht = VoteHashTable(capacity=4)
+        for i in range(20):
+            assert ht.insert(f"key{i}", {"data": i}) == True
+
+        assert ht.size == 20
+        assert ht.get_load_factor() <= VoteHashTable.MAX_LOAD_FACTOR
+        for i in range(20):
+            assert ht.search(f"key{i}")["data"] == i
+        assert ht.insert("key0", {"data": 0}) == False
+
+    def test_stats_when_empty(self):
+        ht = VoteHashTable(capacity=10)
+        stats = ht.get_stats()
+        assert stats["max_chain_length"] == 0
+        assert stats["collision_rate"] == 0
+
+        for i in range(8):
+            ht.insert(f"key{i}", {"data": i})
+        for i in range(8):
+            ht.delete(f"key{i}")
+
+        stats = ht.get_stats()
+        assert stats["size"] == 0
+        assert stats["non_empty_buckets"] == 0
+        assert stats["max_chain_length"] == 0
+
+    def test_delete_keeps_probe_sequences(self):
+        ht = VoteHashTable(capacity=64)
+        for i in range(30):
+            ht.insert(f"key{i}", {"data": i})
+
+        for i in range(0, 30, 2):
+            assert ht.delete(f"key{i}") == True
+        assert ht.delete("key0") == False
+
+        assert ht.size == 15
+        for i in range(30):
+            result = ht.search(f"key{i}")
+            assert (result is None) if i % 2 == 0 else (result["data"] == i)
+        assert ht.update("key1", {"data": "updated"}) == True
+        assert ht.search("key1")["data"] == "updated"
+
 class TestCandidateArray:
     """Test Candidate Array implementation."""
     
@@ -144,7 +224,31 @@ class TestCandidateArray:
         # Check vote count
         results = array.get_results()
         assert results[0]["vote_count"] == 2
-    
+
+    def test_results_sorted_with_stable_ties(self):
+        array = CandidateArray(capacity=5)
+        for cid in ("candidate_a", "candidate_b", "candidate_c"):
+            array.insert(cid, cid.title())
+        array.increment_vote("candidate_c")
+
+        results = array.get_results()
+        assert [r["candidate_id"] for r in results] == ["candidate_c", "candidate_a", "candidate_b"]
+        assert all(type(r["vote_count"]) is int for r in results)
+
+    def test_delete_keeps_search_consistent(self):
+        array = CandidateArray(capacity=5)
+        array.insert("candidate_a", "Candidate A")
+        array.insert("candidate_b", "Candidate B")
+        array.insert("candidate_c", "Candidate C")
+
+        assert array.delete_candidate("candidate_a") == True
+        assert array.search_by_id("candidate_a") == -1
+        assert array.get_candidate(array.search_by_id("candidate_c"))["candidate_id"] == "candidate_c"
+
+        # Deleted ID can be re-inserted
+        assert array.insert("candidate_a", "Candidate A") == True
+        assert array.insert("candidate_a", "Candidate A") == False
+
     def test_array_stats(self):
         array = CandidateArray(capacity=10)
         array.insert("candidate_a", "Candidate A")
@@ -153,6 +257,29 @@ class TestCandidateArray:
         assert stats["current_size"] == 1
         assert stats["capacity"] == 10
 
+    def test_summary_tracks_vote_changes(self):
+        array = CandidateArray(capacity=5)
+        assert array.get_stats()["max_votes"] is None
+
+        array.insert("candidate_a", "Candidate A")
+        array.insert("candidate_b", "Candidate B")
+        array.increment_vote("candidate_b")
+        array.increment_vote("candidate_b")
+        array.increment_vote("candidate_a")
+        assert array.get_summary() == (3, 1, 2, 1)
+
+        array.decrement_vote("candidate_b")
+        array.decrement_vote("candidate_b")
+        assert array.get_winner()["candidate_id"] == "candidate_a"
+        assert array.get_total_votes() == 1
+        stats = array.get_stats()
+        assert (stats["max_votes"], stats["min_votes"]) == (1, 0)
+
+    def test_scan_fallback_matches_loop(self):
+        votes = np.array([3, 7, 7, 0, 2, 9], dtype=np.int64)
+        for n in range(len(votes) + 1):
+            assert _scan_votes_numpy(votes, n) == _scan_votes_loop(votes, n)
+
 class TestAuditStack:
     """Test Audit Stack implementation."""
     
@@ -195,6 +322,23 @@ class TestAuditStack:
         recent = stack.get_recent_events(3)
         assert len(recent) == 3
         assert recent[-1]["id"] == 4  # Most recent
+    
+    def test_overflow_drops_oldest(self):
+        stack = AuditStack(max_size=3)
+        
+        for i in range(5):
+            stack.push({"type": "TEST", "id": i})
+        
+        assert stack.size() == 3
+        assert [e["id"] for e in stack.get_recent_events(10)] == [2, 3, 4]
+        assert stack.pop()["id"] == 4
+        
+        # JSON round-trip keeps order and the bound
+        restored = AuditStack(max_size=3)
+        restored.from_json(stack.to_json())
+        restored.push({"type": "TEST", "id": 5})
+        restored.push({"type": "TEST", "id": 6})
+        assert [e["id"] for e in restored.get_recent_events(3)] == [3, 5, 6]
 
 class TestCryptoUtils:
     """Test cryptographic utilities."""
@@ -208,6 +352,14 @@ class TestCryptoUtils:
         assert hash1 == hash2
         assert len(hash1) == 64  # SHA-256 hex length
     
+    def test_hash_voter_ids_bulk(self):
+        voter_ids = ["voter1", "voter2", "voter1", ""]
+        hashes = CryptoUtils.hash_voter_ids_bulk(voter_ids)
+        
+        # Same digests, same order as hashing one at a time
+        assert hashes == [CryptoUtils.hash_voter_id(v) for v in voter_ids]
+        assert CryptoUtils.hash_voter_ids_bulk([]) == []
+    
     def test_generate_otac(self):
         otac1 = CryptoUtils.generate_otac()
         otac2 = CryptoUtils.generate_otac()
@@ -377,6 +529,224 @@ class TestVotingSystem:
         assert "total_voters" in data
         assert "merkle_stats" in data
 
+class TestSchema:
+    """Test schema checks run at startup."""
+    
+    def test_create_tables_rejects_legacy_ballots(self, tmp_path):
+        legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with legacy.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE ballots (id INTEGER PRIMARY KEY, seq INTEGER NOT NULL UNIQUE, "
+                "ballot_hash VARCHAR NOT NULL UNIQUE, candidate_id VARCHAR NOT NULL, timestamp DATETIME)"
+            ))
+        
+        with pytest.raises(RuntimeError, match="clear_database.py"):
+            create_tables(legacy)
+        legacy.dispose()
+    
+    def test_create_tables_accepts_current_schema(self, tmp_path):
+        current = create_engine(f"sqlite:///{tmp_path / 'current.db'}")
+        create_tables(current)
+        create_tables(current)  # Idempotent on an existing database
+        current.dispose()
+
+class TestVotingServiceAsync:
+    """Service-level tests driving the async database paths directly."""
+    
+    @staticmethod
+    def run_scenario(tmp_path, scenario):
+        """Run scenario(session_factory) against a fresh file-backed SQLite DB."""
+        url = f"sqlite:///{tmp_path / 'service.db'}"
+        sync_engine = create_engine(url)
+        Base.metadata.create_all(bind=sync_engine)
+        sync_engine.dispose()
+        
+        async def main():
+            await redis_client.delete(RESULTS_CACHE_KEY, STATS_CACHE_KEY)
+            engine = create_async_engine(to_async_url(url))
+            try:
+                await scenario(async_sessionmaker(engine, autoflush=False, expire_on_commit=False))
+            finally:
+                await engine.dispose()
+        
+        asyncio.run(main())
+    
+    def test_concurrent_casts_count_one_vote(self, tmp_path):
+        async def scenario(Session):
+            service = VotingService()
+            async with Session() as db:
+                await service.register_voters(db, ["V099", "V100"])
+                # Earlier vote so the tally row already exists
+                warmup = (await service.issue_otacs(db, ["V099"]))["otacs"][0]["otac"]
+                assert (await service.cast_vote(db, warmup, "candidate_a"))["success"] == True
+                otac1 = (await service.issue_otacs(db, ["V100"]))["otacs"][0]["otac"]
+                otac2 = (await service.issue_otacs(db, ["V100"]))["otacs"][0]["otac"]
+            
+            async def cast(otac):
+                async with Session() as db:
+                    return await service.cast_vote(db, otac, "candidate_a")
+            
+            # Same OTAC twice plus a second OTAC for the same voter
+            results = await asyncio.gather(cast(otac1), cast(otac1), cast(otac2))
+            assert sum(r["success"] for r in results) == 1
+            
+            async with Session() as db:
+                assert await db.scalar(select(func.count()).select_from(Ballot)) == 2
+                assert await db.scalar(select(Tally.count).where(Tally.candidate_id == "candidate_a")) == 2
+                results = await service.get_results(db)
+                assert results["total_votes"] == 2
+        
+        self.run_scenario(tmp_path, scenario)
+    
+    def test_results_follow_votes_from_other_workers(self, tmp_path):
+        async def scenario(Session):
+            worker_a, worker_b = VotingService(), VotingService()
+            async with Session() as db:
+                await worker_a.register_voters(db, ["V300", "V301"])
+                otacs = (await worker_a.issue_otacs(db, ["V300", "V301"]))["otacs"]
+                
+                await worker_a.cast_vote(db, otacs[0]["otac"], "candidate_a")
+                assert (await worker_b.get_results(db))["total_votes"] == 1
+                
+                # Votes cast through another process reach this one on the next cache miss
+                await worker_a.cast_vote(db, otacs[1]["otac"], "candidate_b")
+                assert (await worker_b.get_results(db))["total_votes"] == 2
+        
+        self.run_scenario(tmp_path, scenario)
+    
+    def test_failed_cast_leaves_voter_unflagged(self, tmp_path, monkeypatch):
+        def fail_ballot_hash(candidate_id, round_salt=None):
+            raise RuntimeError("ballot hash unavailable")
+        
+        async def scenario(Session):
+            service = VotingService()
+            async with Session() as db:
+                await service.register_voters(db, ["V400"])
+                otac = (await service.issue_otacs(db, ["V400"]))["otacs"][0]["otac"]
+                
+                # Fails after the OTAC and voter are claimed, so the cast rolls back
+                with monkeypatch.context() as patch:
+                    patch.setattr(CryptoUtils, "generate_ballot_hash", staticmethod(fail_ballot_hash))
+                    assert (await service.cast_vote(db, otac, "candidate_a"))["success"] == False
+                voter_hash = CryptoUtils.hash_voter_id("V400")
+                assert service.voter_hash_table.search(voter_hash).has_voted == False
+                
+                # Rolled back claims on the OTAC and voter are released too
+                assert (await service.cast_vote(db, otac, "candidate_a"))["success"] == True
+                assert service.voter_hash_table.search(voter_hash).has_voted == True
+        
+        self.run_scenario(tmp_path, scenario)
+    
+    def test_cache_failures_do_not_fail_requests(self, tmp_path, monkeypatch):
+        class FailingPipeline:
+            def hset(self, *args):
+                return self
+            def delete(self, *args):
+                return self
+            async def execute(self):
+                raise ConnectionError("redis down")
+        
+        async def fail(*args, **kwargs):
+            raise ConnectionError("redis down")
+        
+        async def scenario(Session):
+            service = VotingService()
+            async with Session() as db:
+                await service.register_voters(db, ["V500"])
+                otac = (await service.issue_otacs(db, ["V500"]))["otacs"][0]["otac"]
+                
+                with monkeypatch.context() as patch:
+                    patch.setattr(redis_client, "pipeline", lambda transaction=True: FailingPipeline())
+                    patch.setattr(redis_client, "get", fail)
+                    patch.setattr(redis_client, "setex", fail)
+                    
+                    # The vote is committed, so the caller must be told it succeeded
+                    assert (await service.cast_vote(db, otac, "candidate_a"))["success"] == True
+                    assert (await service.get_results(db))["total_votes"] == 1
+                    assert (await service.get_system_stats(db))["voted_count"] == 1
+                    assert (await service.undo_last_action(db))["success"] == True
+        
+        self.run_scenario(tmp_path, scenario)
+    
+    def test_vote_during_results_sync_is_not_cached_over(self, tmp_path):
+        async def scenario(Session):
+            service = VotingService()
+            async with Session() as db:
+                await service.register_voters(db, ["V600", "V601"])
+                otacs = (await service.issue_otacs(db, ["V600", "V601"]))["otacs"]
+                await service.cast_vote(db, otacs[0]["otac"], "candidate_a")
+            
+            async def sync_with_vote_in_flight(db):
+                # Tallies are read, another request commits a vote, then the
+                # older tallies are applied to the array
+                tallies = (await db.scalars(select(Tally))).all()
+                async with Session() as other:
+                    assert (await service.cast_vote(other, otacs[1]["otac"], "candidate_a"))["success"] == True
+                for tally in tallies:
+                    service.candidate_array.set_vote_count(tally.candidate_id, tally.count)
+            
+            async with Session() as db:
+                service._sync_array_with_database = sync_with_vote_in_flight
+                assert (await service.get_results(db))["total_votes"] == 1
+                del service._sync_array_with_database
+                assert (await service.get_results(db))["total_votes"] == 2
+        
+        self.run_scenario(tmp_path, scenario)
+    
+    def test_audit_trail_strips_voter_hash(self, tmp_path):
+        def contains_voter_hash(value):
+            if isinstance(value, dict):
+                return "voter_hash" in value or any(contains_voter_hash(v) for v in value.values())
+            if isinstance(value, list):
+                return any(contains_voter_hash(v) for v in value)
+            return False
+        
+        async def scenario(Session):
+            service = VotingService()
+            async with Session() as db:
+                await service.register_voters(db, ["V700"])
+                otac = (await service.issue_otacs(db, ["V700"]))["otacs"][0]["otac"]
+                await service.cast_vote(db, otac, "candidate_a")
+                assert (await service.undo_last_action(db))["success"] == True
+                
+                trail = await service.get_audit_trail(db)
+                assert {"CAST", "UNDO"} <= {event["type"] for event in trail}
+                assert not contains_voter_hash(trail)
+                
+                # The stored CAST row keeps the full hash for undo lookups
+                cast_row = await db.scalar(select(AuditEvent).where(AuditEvent.type == "CAST"))
+                assert cast_row.details["voter_hash"] == CryptoUtils.hash_voter_id("V700")
+        
+        self.run_scenario(tmp_path, scenario)
+    
+    def test_cast_undo_and_recast(self, tmp_path):
+        async def scenario(Session):
+            service = VotingService()
+            async with Session() as db:
+                await service.register_voters(db, ["V200", "V201"])
+                otacs = (await service.issue_otacs(db, ["V200", "V201"]))["otacs"]
+                
+                first = await service.cast_vote(db, otacs[0]["otac"], "candidate_a")
+                assert first["success"] == True
+                assert (await service.cast_vote(db, otacs[0]["otac"], "candidate_a"))["success"] == False
+                assert (await service.cast_vote(db, otacs[1]["otac"], "candidate_b"))["success"] == True
+                assert (await service.get_results(db))["total_votes"] == 2
+                
+                # Undo the last cast; that voter can vote again with a new OTAC
+                assert (await service.undo_last_action(db))["success"] == True
+                assert (await service.get_results(db))["total_votes"] == 1
+                assert (await service.lookup_ballot(db, first["ballot_hash"]))["found"] == True
+                
+                otac = (await service.issue_otacs(db, ["V201"]))["otacs"][0]["otac"]
+                assert (await service.cast_vote(db, otac, "candidate_c"))["success"] == True
+                
+                results = {r["candidate_id"]: r["vote_count"] for r in (await service.get_results(db))["results"]}
+                assert results["candidate_a"] == 1
+                assert results["candidate_b"] == 0
+                assert results["candidate_c"] == 1
+        
+        self.run_scenario(tmp_path, scenario)
+
 class TestPerformance:
     """Performance and complexity tests."""
     
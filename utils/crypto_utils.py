@@ -1,7 +1,7 @@
 import hashlib
 import secrets
 import hmac
-from typing import Tuple
+from typing import List, Tuple
 from config import Config
 
 class CryptoUtils:
@@ -21,6 +21,28 @@ class CryptoUtils:
         combined = Config.SALT + voter_id
         return hashlib.sha256(combined.encode()).hexdigest()
     
+    @staticmethod
+    def hash_voter_ids_bulk(voter_ids: List[str]) -> List[str]:
+        """
+        Salted hashes of many voter IDs, same digests as hash_voter_id.
+        
+        The salt is absorbed into one SHA-256 state that is copied per ID,
+        so each digest only hashes the ID itself.
+        
+        Args:
+            voter_ids: Original voter IDs
+            
+        Returns:
+            Hex digests in the same order as voter_ids
+        """
+        salted = hashlib.sha256(Config.SALT.encode())
+        hashes = []
+        for voter_id in voter_ids:
+            digest = salted.copy()
+            digest.update(voter_id.encode())
+            hashes.append(digest.hexdigest())
+        return hashes
+    
     @staticmethod
     def hash_otac(otac: str) -> str:
         """